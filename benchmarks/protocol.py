@@ -0,0 +1,52 @@
+"""
+Throughput of the MeCom protocol engine without any I/O.
+
+Responses are fed to the engine in chunks of the given size, so that both framing
+and validation are measured::
+
+    python benchmarks/protocol.py --responses 100000 --chunk-size 64
+"""
+import argparse
+import time
+
+from meer_tec.mecom import Message, construct_param_cmd, construct_response
+from meer_tec.protocol import MeComProtocol, Response
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--responses", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    # sequence numbers have 16 bits, they are reused in rounds of 65536 responses
+    protocol = MeComProtocol()
+    elapsed = 0.0
+    responses = 0
+    total_bytes = 0
+    for offset in range(0, args.responses, 65536):
+        n = min(args.responses - offset, 65536)
+        requests = [
+            Message(construct_param_cmd(1, "?VR", 1000, float, seq_num=i), float)
+            for i in range(n)
+        ]
+        data = "".join(construct_response(1, i, "41B40000") for i in range(n))
+        data_bytes = data.encode("ascii")
+        for request in requests:
+            protocol.send(request)
+
+        start = time.perf_counter()
+        for i in range(0, len(data_bytes), args.chunk_size):
+            events = protocol.receive_data(data_bytes[i : i + args.chunk_size])
+            responses += sum(isinstance(event, Response) for event in events)
+        elapsed += time.perf_counter() - start
+        total_bytes += len(data_bytes)
+    assert responses == args.responses
+    print(
+        f"{responses} responses: {responses / elapsed:.0f} responses/s, "
+        f"{total_bytes / elapsed / 1e6:.1f} MB/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Soak and scaling test against simulated devices behind XPort-like endpoints.
+
+Every link is a local TCP endpoint with a number of simulated devices. Worker
+threads drive the devices through the public TEC API and the harness reports
+throughput, latency percentiles, error rate and memory growth. Several values per
+option run all combinations, e.g. to find where the library stops scaling::
+
+    python benchmarks/soak.py --links 1 4 16 --devices-per-link 8 64 --duration 10
+
+Latencies are counted in a histogram of fixed size, so that the harness itself does
+not grow with the number of requests. Memory is sampled as resident set size at the
+report points only and includes the simulated devices, which run in the same
+process. To find where the memory goes, trace allocations in a separate run with
+``--trace-memory``, which slows down the requests and distorts throughput and
+latency.
+
+For long runs, use a long duration and a report interval::
+
+    python benchmarks/soak.py --links 8 --devices-per-link 32 --duration 14400 \\
+        --report-interval 300
+
+With ``--port 10001``, link i listens on 127.0.0.<i + 1>:10001 like a rack of
+XPorts (Linux only); by default, free ports on 127.0.0.1 are used.
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from meer_tec.interfaces import XPort
+from meer_tec.simulator import SimulatedDevice, SimulatedXPort
+from meer_tec.tec import TEC
+
+# latency histogram from 1 µs to 100 s with 20 logarithmic buckets per decade
+BUCKETS_PER_DECADE = 20
+MIN_LATENCY = 1e-6
+BUCKETS = 8 * BUCKETS_PER_DECADE
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.histogram = [0] * BUCKETS
+        self.errors = 0
+
+    def record(self, latency: float) -> None:
+        bucket = int(
+            math.log10(max(latency, MIN_LATENCY) / MIN_LATENCY) * BUCKETS_PER_DECADE
+        )
+        with self.lock:
+            self.histogram[min(bucket, BUCKETS - 1)] += 1
+
+    def error(self) -> None:
+        with self.lock:
+            self.errors += 1
+
+    def take(self) -> Tuple[List[int], int]:
+        """Return histogram and error count since the last call and reset them."""
+        with self.lock:
+            histogram, errors = self.histogram[:], self.errors
+            self.histogram[:] = [0] * BUCKETS
+            self.errors = 0
+        return histogram, errors
+
+
+def percentile(histogram: List[int], fraction: float) -> float:
+    """Upper edge of the bucket containing the given fraction of the latencies."""
+    target = fraction * sum(histogram)
+    count = 0
+    for bucket, bucket_count in enumerate(histogram):
+        count += bucket_count
+        if count >= target and bucket_count:
+            break
+    return MIN_LATENCY * 10 ** ((bucket + 1) / BUCKETS_PER_DECADE)
+
+
+def rss_mb() -> float:
+    """Resident set size of the process in MB, the peak where the current is unknown."""
+    if sys.platform == "win32":
+        return math.nan
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except OSError:
+        import resource
+
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+
+
+def memory_mb() -> float:
+    """Traced memory in MB if allocations are traced, otherwise the RSS."""
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0] / 1024**2
+    return rss_mb()
+
+
+def worker(tecs: List[TEC], stats: Stats, stop: threading.Event, writes: float) -> None:
+    rng = random.Random()
+    while not stop.is_set():
+        tec = rng.choice(tecs)
+        start = time.perf_counter()
+        try:
+            if rng.random() < writes:
+                tec.target_object_temperature = rng.uniform(15, 35)
+            else:
+                tec.object_temperature
+        except (OSError, ValueError):
+            stats.error()
+            tec.clear()
+        else:
+            stats.record(time.perf_counter() - start)
+
+
+def report(
+    label: str, histogram: List[int], errors: int, elapsed: float, memory: float
+) -> str:
+    requests = sum(histogram)
+    if not requests:
+        return f"{label} no successful requests, {errors} errors"
+    return (
+        f"{label} {requests / elapsed:9.0f} req/s "
+        f"p50<{percentile(histogram, 0.5) * 1e3:7.2f} ms "
+        f"p95<{percentile(histogram, 0.95) * 1e3:7.2f} ms "
+        f"p99<{percentile(histogram, 0.99) * 1e3:7.2f} ms "
+        f"errors={errors / (requests + errors):.2%} "
+        f"{'traced' if tracemalloc.is_tracing() else 'rss'}={memory:6.1f} MB"
+    )
+
+
+def run(
+    links: int,
+    devices_per_link: int,
+    concurrency: int,
+    duration: float,
+    report_interval: float,
+    latency: float,
+    writes: float,
+    port: int,
+    trace_memory: bool,
+) -> None:
+    endpoints = []
+    tecs = []
+    for link in range(links):
+        host = f"127.0.0.{link + 1}" if port else "127.0.0.1"
+        devices = [SimulatedDevice(addr) for addr in range(1, devices_per_link + 1)]
+        endpoint = SimulatedXPort(devices, host=host, port=port, latency=latency)
+        endpoint.start()
+        endpoints.append(endpoint)
+        xport = XPort(*endpoint.server_address)
+        tecs += [TEC(xport, device.device_addr) for device in devices]
+
+    stats = Stats()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=worker, args=(tecs, stats, stop, writes))
+        for _ in range(concurrency)
+    ]
+    label = f"links={links:3} devices={links * devices_per_link:5} "
+    if trace_memory:
+        tracemalloc.start()
+    baseline = memory = math.nan
+    start = last = time.monotonic()
+    for thread in threads:
+        thread.start()
+    try:
+        while time.monotonic() - start < duration:
+            stop.wait(min(report_interval, duration - (time.monotonic() - start)))
+            now = time.monotonic()
+            histogram, errors = stats.take()
+            memory = memory_mb()
+            if math.isnan(baseline):  # after warm-up
+                baseline = memory
+            print(report(label, histogram, errors, now - last, memory), flush=True)
+            last = now
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        tracemalloc.stop()
+        for endpoint in endpoints:
+            endpoint.stop()
+    growth = memory - baseline
+    print(
+        f"{label} memory growth after first report: {growth * 1024:.1f} kB "
+        "(library and simulated devices, same process)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--links", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--devices-per-link", type=int, nargs="+", default=[8, 64])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="bus time per request in s"
+    )
+    parser.add_argument(
+        "--writes", type=float, default=0.1, help="fraction of requests that write"
+    )
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="trace allocations with tracemalloc"
+    )
+    args = parser.parse_args()
+
+    for links, devices_per_link, concurrency in itertools.product(
+        args.links, args.devices_per_link, args.concurrency
+    ):
+        run(
+            links,
+            devices_per_link,
+            concurrency,
+            args.duration,
+            args.report_interval,
+            args.latency,
+            args.writes,
+            args.port,
+            args.trace_memory,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Round-trip time of the USB interface against a pty loopback.
+
+A thread answers every request on the other end of a pseudo terminal, so the
+measured time consists of the interface and driver overhead only::
+
+    python benchmarks/usb_latency.py --queries 500
+"""
+import argparse
+import os
+import statistics
+import struct
+import sys
+import threading
+import time
+
+from meer_tec.mecom import Message, construct_response
+from meer_tec.protocol import split_frames
+from meer_tec.tec import TEC
+from meer_tec.usb import USB
+
+
+def respond(controller: int) -> None:
+    payload = struct.pack("!f", 21.0).hex().upper()
+    buffer = bytearray()
+    while True:
+        try:
+            buffer += os.read(controller, 128)
+        except OSError:
+            return
+        for frame in split_frames(buffer):
+            request = Message(frame, value_type=float)
+            response = construct_response(request.device_addr, request.seq_num, payload)
+            os.write(controller, response.encode("ascii"))
+
+
+def benchmark(port: str, queries: int, low_latency: bool, baudrate: int) -> None:
+    usb = USB(port, low_latency=low_latency, baudrate=baudrate)
+    tec = TEC(usb, 1)
+    rtts = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        tec.object_temperature
+        rtts.append(time.perf_counter() - start)
+    usb.close()
+    rtts.sort()
+    print(
+        f"low_latency={low_latency!s:5} "
+        f"mean={statistics.mean(rtts) * 1e3:.3f} ms "
+        f"p50={rtts[len(rtts) // 2] * 1e3:.3f} ms "
+        f"p99={rtts[int(len(rtts) * 0.99)] * 1e3:.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--baudrate", type=int, default=57600)
+    args = parser.parse_args()
+    if sys.platform == "win32":
+        parser.exit(1, "The benchmark requires a pty, which Windows does not provide\n")
+    import pty
+
+    controller, device = pty.openpty()
+    threading.Thread(target=respond, args=(controller,), daemon=True).start()
+    for low_latency in [False, True]:
+        benchmark(os.ttyname(device), args.queries, low_latency, args.baudrate)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,143 @@
 import socket
-import time
-from typing import Protocol
-
-import serial
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Protocol, TypeVar
 
 from .mecom import Message
+from .protocol import MeComProtocol, find_response
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from .usb import USB  # noqa F401
 
 
 class Interface(Protocol):
     def query(self, request: Message) -> Message:
         ...
 
+    def transmit(self, request: Message) -> None:
+        ...
+
     def clear(self) -> None:
         ...
 
 
+_locks: "weakref.WeakKeyDictionary[Any, threading.RLock]" = weakref.WeakKeyDictionary()
+_executors: "weakref.WeakKeyDictionary[Any, ThreadPoolExecutor]" = (
+    weakref.WeakKeyDictionary()
+)
+_registry_lock = threading.Lock()
+# weak reference to the interface served by the current worker thread
+_worker = threading.local()
+
+T = TypeVar("T")
+
+
+def get_lock(interface: Interface) -> threading.RLock:
+    """
+    Lock of an interface.
+
+    Every exchange on an interface has to hold its lock, so that requests and
+    responses of different threads do not interleave.
+    """
+    with _registry_lock:
+        if interface not in _locks:
+            _locks[interface] = threading.RLock()
+        return _locks[interface]
+
+
+def get_executor(interface: Interface) -> "ThreadPoolExecutor":
+    """Executor with a single worker thread serving all requests on an interface."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    with _registry_lock:
+        if interface not in _executors:
+            _executors[interface] = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="meer_tec",
+                initializer=_init_worker,
+                initargs=(weakref.ref(interface),),
+            )
+        return _executors[interface]
+
+
+def _init_worker(interface: "weakref.ref[Any]") -> None:
+    _worker.interface = interface
+
+
+def submit(
+    interface: Interface, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> "Future[T]":
+    """
+    Call a function on the worker thread of an interface.
+
+    If called on that worker thread already, e.g. by a task or a done callback, the
+    function is called immediately instead, as waiting for a queued call would block
+    the worker forever.
+    """
+    from concurrent.futures import Future
+
+    ref = getattr(_worker, "interface", None)
+    if ref is None or ref() is not interface:
+        return get_executor(interface).submit(func, *args, **kwargs)
+    future: "Future[T]" = Future()
+    try:
+        future.set_result(func(*args, **kwargs))
+    except BaseException as error:
+        future.set_exception(error)
+    return future
+
+
 class XPort(socket.socket):
     def __init__(self, ip: str, port: int = 10001) -> None:
         super().__init__(socket.AF_INET, socket.SOCK_STREAM)
         self.settimeout(0.2)
         self.ip = ip
         self.port = port
+        self.protocol = MeComProtocol()
         super().connect((self.ip, self.port))
 
     def query(self, request: Message) -> Message:
-        self.send(request.encode("ascii"))
-        time.sleep(0.01)
-        response = self.recv(128).decode("ascii")
-        return Message(response, value_type=request.value_type)
+        self.transmit(request)
+        return self.receive(request)
+
+    def transmit(self, request: Message) -> None:
+        """Send a request without waiting for the response."""
+        self.sendall(self.protocol.send(request))
+
+    def receive(self, request: Message) -> Message:
+        """Receive the response to a request, skipping responses to other requests."""
+        try:
+            while True:
+                data = self.recv(128)
+                if not data:
+                    raise ConnectionError("XPort closed the connection")
+                response = find_response(self.protocol.receive_data(data), request)
+                if response is not None:
+                    return response
+        finally:
+            self.protocol.forget(request)
 
     def clear(self) -> None:
-        _ = self.recv(128)
+        """Discard all received data that has not been read yet."""
+        self.protocol.clear()
+        timeout = self.gettimeout()
+        self.setblocking(False)
+        try:
+            while self.recv(1024):
+                pass
+        except BlockingIOError:
+            pass
+        finally:
+            self.settimeout(timeout)
 
 
-class USB(serial.Serial):
-    def __init__(self, port: str, timeout: int = 1, baudrate: int = 57600) -> None:
-        super().__init__(
-            port, baudrate=baudrate, timeout=timeout, write_timeout=timeout
-        )
+def __getattr__(name: str) -> Any:
+    # USB is imported on first use only, so that pyserial is not loaded when only
+    # XPort or the MeCom functions are used
+    if name == "USB":
+        from . import usb
 
-    def query(self, request: "Message") -> str:
-        self.write(request.encode("ascii"))
-        time.sleep(0.01)
-        response = self.read(128).decode("ascii")
-        return Message(response, value_type=request.value_type)
+        return usb.USB
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,38 @@
+import binascii
 import random
 import struct
 from typing import Generic, Literal, Optional, Type, TypeVar
 
-from PyCRC.CRCCCITT import CRCCCITT as CRC
-
 PARAM_CMDS = ["VS", "?VR"]
+BROADCAST_ADDR = 0
 FloatOrInt = TypeVar("FloatOrInt", float, int)
+ERROR_CODES = {
+    1: "Command not available",
+    2: "Device is busy",
+    3: "General communication error",
+    4: "Format error",
+    5: "Parameter is not available",
+    6: "Parameter is read only",
+    7: "Value is out of range",
+    8: "Parameter instance is not available",
+}
 ParamCmds = Literal["VS", "?VR"]
 
 
+class MeComError(ValueError):
+    def __init__(self, code: int) -> None:
+        """
+        Error reported by a device in response to a request.
+
+        :param code: MeCom error code
+        """
+        self.code = code
+        super().__init__(f"{ERROR_CODES.get(code, 'Unknown error')} (code {code})")
+
+
 def calc_checksum(string: str) -> str:
-    """Calculate CRC checksum."""
-    return f"{CRC().calculate(string):04X}"
+    """Calculate CRC checksum (CRC-16-CCITT, XModem)."""
+    return f"{binascii.crc_hqx(string.encode('ascii'), 0):04X}"
 
 
 def construct_param_cmd(
@@ -56,8 +77,8 @@ def construct_param_cmd(
         if value is None:
             raise ValueError("value must be given for VS command")
         if value_type is float:
-            # convert float to hex of length 8, remove the leading '0X' and capitalize
-            val = hex(struct.unpack("<I", struct.pack("<f", value))[0])[2:].upper()
+            # convert float to hex of length 8
+            val = f"{struct.unpack('<I', struct.pack('<f', value))[0]:08X}"
         elif value_type is int:
             # convert int to hex of length 8
             val = f"{value:08X}"
@@ -88,6 +109,26 @@ def construct_reset_cmd(device_addr: int, seq_num: Optional[int] = None) -> str:
     return f"{cmd}{calc_checksum(cmd)}\r"
 
 
+def construct_response(device_addr: int, seq_num: int, payload: str = "") -> str:
+    """
+    Construct a MeCom response as sent by a device.
+
+    :param device_addr: Device address (0 .. 255)
+    :param seq_num: Sequence number (0 .. 65535) of the request that is answered
+    :param payload: Payload of the response, e.g. the hex encoded value for ?VR
+        requests. Empty for acknowledgements
+    :return: MeCom response
+    """
+    if seq_num < 0 or seq_num > 65535:
+        raise ValueError("seq_num must be between 0 and 65535")
+
+    if device_addr < 0 or device_addr > 255:
+        raise ValueError("device_addr must be between 0 and 255")
+
+    response = f"!{device_addr:02X}{seq_num:04X}{payload}"
+    return f"{response}{calc_checksum(response)}\r"
+
+
 def verify_response(reponse: "Message", request: "Message") -> bool:
     """
     Verify a MeCom response.
@@ -109,7 +150,7 @@ class Message(str, Generic[FloatOrInt]):
 
     def __init__(self, response: str, value_type: Type[FloatOrInt]) -> None:
         self.value_type = value_type
-        self.device_addr = int(self[1:3], 8)
+        self.device_addr = int(self[1:3], 16)
         self.seq_num = int(self[3:7], 16)
         self.payload = self[7:-5]
         self.checksum = self[-5:-1]
@@ -0,0 +1,165 @@
+"""
+MeCom protocol engine without any I/O.
+
+The engine turns requests into bytes to be sent and received bytes into events.
+Transports only move bytes, so framing, sequence number matching and validation are
+implemented once and can be tested and benchmarked without a device::
+
+    protocol = MeComProtocol()
+    transport.write(protocol.send(request))
+    for event in protocol.receive_data(transport.read()):
+        ...
+"""
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+from .mecom import MeComError, Message, calc_checksum
+
+TERMINATOR = b"\r"
+# "!" + address (2) + sequence number (4) + checksum (4) + "\r"
+MIN_FRAME_LENGTH = 12
+# longer than any response, data without a terminator beyond this is discarded
+MAX_FRAME_LENGTH = 128
+
+
+class Response(NamedTuple):
+    """Valid response to a pending request."""
+
+    request: Message
+    response: Message
+
+
+class DeviceError(NamedTuple):
+    """The device rejected a pending request with an error code."""
+
+    request: Message
+    response: Message
+    code: int
+
+
+class UnexpectedResponse(NamedTuple):
+    """Valid response that answers no pending request, e.g. a late one."""
+
+    response: Message
+
+
+class InvalidFrame(NamedTuple):
+    """Received frame that is malformed or corrupted."""
+
+    frame: str
+    reason: str
+
+
+Event = Union[Response, DeviceError, UnexpectedResponse, InvalidFrame]
+
+
+def split_frames(buffer: bytearray) -> Iterator[str]:
+    """Remove complete frames from the start of a buffer and yield them."""
+    while True:
+        end = buffer.find(TERMINATOR)
+        if end < 0:
+            return
+        frame = buffer[: end + 1].decode("ascii", errors="replace")
+        del buffer[: end + 1]
+        yield frame
+
+
+class MeComProtocol:
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        # sequence number → request
+        self._pending: Dict[int, Message] = {}
+
+    @property
+    def pending(self) -> List[Message]:
+        """Requests that have been sent but not answered yet."""
+        return list(self._pending.values())
+
+    @property
+    def buffered(self) -> int:
+        """Number of received bytes that do not form a complete frame yet."""
+        return len(self._buffer)
+
+    def send(self, request: Message) -> bytes:
+        """Register a request as pending and return the bytes to send."""
+        self._pending[request.seq_num] = request
+        return request.encode("ascii")
+
+    def receive_data(self, data: bytes) -> List[Event]:
+        """Process received bytes and return the events of all complete frames."""
+        self._buffer += data
+        events: List[Event] = []
+        for frame in split_frames(self._buffer):
+            # a frame starts at its last start byte, data before it is the rest of
+            # a truncated frame, e.g. after a timeout or colliding responses
+            start = frame.rfind("!")
+            if start > 0:
+                events.append(InvalidFrame(frame[:start], "truncated frame"))
+                frame = frame[start:]
+            events.append(self._parse(frame))
+        if len(self._buffer) > MAX_FRAME_LENGTH:  # noise without a terminator
+            # keep the start of a frame that may still be completed
+            start = self._buffer.rfind(b"!")
+            if start < 0 or len(self._buffer) - start > MAX_FRAME_LENGTH:
+                start = len(self._buffer)
+            frame = self._buffer[:start].decode("ascii", errors="replace")
+            del self._buffer[:start]
+            events.append(InvalidFrame(frame, "frame too long"))
+        return events
+
+    def forget(self, request: Message) -> None:
+        """Stop waiting for the response to a request, e.g. after a timeout."""
+        if self._pending.get(request.seq_num) is request:
+            del self._pending[request.seq_num]
+
+    def clear(self) -> None:
+        """Discard buffered data and forget all pending requests."""
+        self._buffer.clear()
+        self._pending.clear()
+
+    def _parse(self, frame: str) -> Event:
+        if not frame.startswith("!") or len(frame) < MIN_FRAME_LENGTH:
+            return InvalidFrame(frame, "malformed frame")
+        if frame[-5:-1] != calc_checksum(frame[:-5]):
+            return InvalidFrame(frame, "checksum mismatch")
+        try:
+            response = Message(frame, value_type=int)
+        except ValueError:
+            return InvalidFrame(frame, "malformed frame")
+        request = self._pending.pop(response.seq_num, None)
+        if request is None:
+            return UnexpectedResponse(response)
+
+        response = Message(frame, value_type=request.value_type)
+        if response.payload.startswith("+"):
+            try:
+                code = int(response.payload[1:], 16)
+            except ValueError:
+                return InvalidFrame(frame, "malformed error code")
+            return DeviceError(request, response, code)
+        return Response(request, response)
+
+
+def find_response(events: List[Event], request: Message) -> Optional[Message]:
+    """
+    Pick the response to a request from a list of events.
+
+    Responses to other requests are ignored, e.g. late acknowledgements of a
+    broadcast, and so are invalid frames if the response is among the events.
+
+    :raises MeComError: If the device rejected the request
+    :raises ValueError: If a corrupted frame was received instead of the response
+    :return: Response or None if it was not among the events
+    """
+    invalid: Optional[InvalidFrame] = None
+    for event in events:
+        if isinstance(event, InvalidFrame):
+            invalid = invalid or event
+        elif isinstance(event, UnexpectedResponse):
+            continue
+        elif event.request is request:
+            if isinstance(event, DeviceError):
+                raise MeComError(event.code)
+            return event.response
+    if invalid is not None:
+        raise ValueError(f"Invalid response {invalid.frame!r}: {invalid.reason}")
+    return None
@@ -0,0 +1,226 @@
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, List, Optional, Type
+
+from .interfaces import Interface
+from .mecom import FloatOrInt
+from .tec import TEC
+
+
+class Task(Generic[FloatOrInt]):
+    def __init__(
+        self,
+        tec: TEC,
+        param_id: int,
+        value_type: Type[FloatOrInt],
+        rate: float,
+        priority: int = 0,
+        param_inst: int = 1,
+        callback: Optional[Callable[["Task[FloatOrInt]"], None]] = None,
+    ) -> None:
+        """
+        Periodic read of a parameter.
+
+        :param tec: TEC to read from
+        :param param_id: Parameter ID (0 .. 65535)
+        :param value_type: Value type (int or float)
+        :param rate: Target rate in Hz. 0 reads the parameter only once
+        :param priority: Tasks with higher priority are served first if the link is
+            saturated
+        :param param_inst: Parameter instance (0 .. 255)
+        :param callback: Called with the task after each successful read. Exceptions
+            raised by the callback are counted as errors of the task
+        """
+        if rate < 0:
+            raise ValueError("rate must not be negative")
+        self.tec = tec
+        self.param_id = param_id
+        self.value_type: Type[FloatOrInt] = value_type
+        self.rate = rate
+        self.priority = priority
+        self.param_inst = param_inst
+        self.callback: Optional[Callable[[Task[FloatOrInt]], None]] = callback
+
+        self.allocated_rate = rate
+        self.next_due = 0.0
+        self.value: Optional[FloatOrInt] = None
+        self.timestamp: Optional[float] = None
+        self.count = 0
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
+        self._first_timestamp: Optional[float] = None
+
+    @property
+    def shortfall(self) -> float:
+        """Difference between target rate and the rate the link can provide."""
+        return self.rate - self.allocated_rate
+
+    @property
+    def achieved_rate(self) -> float:
+        """Rate in Hz at which the parameter was actually read."""
+        if self.count < 2 or self.timestamp is None or self._first_timestamp is None:
+            return 0.0
+        return (self.count - 1) / (self.timestamp - self._first_timestamp)
+
+    def _record(self, value: FloatOrInt, timestamp: float) -> None:
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+        self.value = value
+        self.timestamp = timestamp
+        self.count += 1
+        if self.callback is not None:
+            self.callback(self)
+
+    def __repr__(self) -> str:
+        return (
+            f"Task(device_addr={self.tec.device_addr}, param_id={self.param_id}, "
+            f"param_inst={self.param_inst}, rate={self.rate})"
+        )
+
+
+class _Link:
+    """Tasks sharing one interface, served one request at a time."""
+
+    def __init__(self, interface: Interface, headroom: float) -> None:
+        self.interface = interface
+        self.headroom = headroom
+        self.tasks: List[Task[Any]] = []
+        self.rtt: Optional[float] = None
+
+    @property
+    def capacity(self) -> float:
+        """Requests per second the link can handle, based on the measured RTT."""
+        if not self.rtt:
+            return math.inf
+        return self.headroom / self.rtt
+
+    def allocate(self) -> None:
+        """Distribute the capacity of the link among the tasks by priority."""
+        remaining = self.capacity
+        for task in sorted(self.tasks, key=lambda task: -task.priority):
+            if task.rate == 0:
+                continue
+            task.allocated_rate = min(task.rate, remaining)
+            remaining -= task.allocated_rate
+
+    def step(self) -> float:
+        """
+        Serve the most urgent due task.
+
+        :return: Time in seconds until the next task is due
+        """
+        now = time.monotonic()
+        due = [task for task in self.tasks if task.next_due <= now]
+        if not due:
+            return min(task.next_due for task in self.tasks) - now
+        # one-time reads first, then by priority, then the longest overdue
+        task = max(due, key=lambda t: (t.rate == 0, t.priority, -t.next_due))
+
+        try:
+            value = task.tec.get_parameter(
+                task.param_id, value_type=task.value_type, param_inst=task.param_inst
+            )
+        except (OSError, ValueError) as error:
+            task.errors += 1
+            task.last_error = error
+            task.tec.clear()
+        else:
+            end = time.monotonic()
+            self._update_rtt(end - now)
+            try:
+                task._record(value, end)
+            except Exception as error:  # a failing callback must not stop the link
+                task.errors += 1
+                task.last_error = error
+
+        if task.rate == 0:
+            task.next_due = math.inf if task.count else now + 1.0
+        elif task.allocated_rate > 0:
+            interval = 1 / task.allocated_rate
+            task.next_due += interval
+            if task.next_due < now:  # drop missed slots instead of bursting
+                task.next_due = now + interval
+        else:
+            task.next_due = now + 1.0  # starved, check again after reallocation
+        return 0.0
+
+    def _update_rtt(self, rtt: float, alpha: float = 0.2) -> None:
+        self.rtt = rtt if self.rtt is None else (1 - alpha) * self.rtt + alpha * rtt
+        self.allocate()
+
+
+class Scheduler:
+    def __init__(self, headroom: float = 0.9) -> None:
+        """
+        Poll parameters of many TECs at individual rates.
+
+        Tasks are grouped by interface. Each interface is served by its own thread,
+        which measures the round-trip time of the link and distributes the resulting
+        capacity among its tasks by priority.
+
+        :param headroom: Fraction of the measured link capacity that is used
+        """
+        self.headroom = headroom
+        self._links: Dict[int, _Link] = {}
+        self._stop = threading.Event()
+
+    @property
+    def tasks(self) -> List[Task[Any]]:
+        return [task for link in self._links.values() for task in link.tasks]
+
+    def add(
+        self,
+        tec: TEC,
+        param_id: int,
+        value_type: Type[FloatOrInt],
+        rate: float,
+        priority: int = 0,
+        param_inst: int = 1,
+        callback: Optional[Callable[[Task[FloatOrInt]], None]] = None,
+    ) -> Task[FloatOrInt]:
+        """Add a parameter read. See :class:`Task` for the arguments."""
+        task = Task(tec, param_id, value_type, rate, priority, param_inst, callback)
+        key = id(tec.interface)
+        if key not in self._links:
+            self._links[key] = _Link(tec.interface, self.headroom)
+        link = self._links[key]
+        link.tasks.append(task)
+        link.allocate()
+        return task
+
+    def link_rtt(self, interface: Interface) -> Optional[float]:
+        """Measured round-trip time of an interface in seconds."""
+        link = self._links.get(id(interface))
+        return None if link is None else link.rtt
+
+    def shortfall(self) -> Dict[Task[Any], float]:
+        """Tasks that can not be served at their target rate and the missing rate."""
+        return {task: task.shortfall for task in self.tasks if task.shortfall > 0}
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """
+        Poll until :meth:`stop` is called or `duration` seconds have passed.
+
+        :param duration: Time in seconds to run. Runs until stopped if not given
+        """
+        self._stop.clear()
+        threads = [
+            threading.Thread(target=self._serve, args=(link,), daemon=True)
+            for link in self._links.values()
+        ]
+        for thread in threads:
+            thread.start()
+        self._stop.wait(duration)
+        self._stop.set()
+        for thread in threads:
+            thread.join()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _serve(self, link: _Link) -> None:
+        while not self._stop.is_set():
+            wait = link.step()
+            if wait > 0:
+                self._stop.wait(wait)
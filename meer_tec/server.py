@@ -0,0 +1,188 @@
+"""
+Telemetry server sharing one interface between many local processes.
+
+The server owns the connection to the TECs and speaks MeCom towards its clients,
+just like an XPort does. Clients therefore connect with a regular
+:class:`~meer_tec.interfaces.XPort` pointing to the server::
+
+    from meer_tec.interfaces import XPort
+    from meer_tec.tec import TEC
+    tec = TEC(XPort("127.0.0.1", 10001), 3)
+
+Requests of all clients are serialized on the shared interface, so frames of
+different processes can no longer interleave. Responses to parameter reads are
+cached for ``max_age`` seconds, so that several clients polling the same parameter
+cause only one exchange on the bus. Cached values are served without waiting for
+the bus, concurrent reads of the same parameter share one exchange.
+"""
+
+import argparse
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from .interfaces import Interface, get_lock
+from .mecom import BROADCAST_ADDR, MeComError, Message, construct_response
+from .protocol import split_frames
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "Server"
+
+    def handle(self) -> None:
+        buffer = bytearray()
+        while True:
+            try:
+                data = self.request.recv(1024)
+            except OSError:
+                return
+            if not data:
+                return
+            buffer += data
+            for frame in split_frames(buffer):
+                try:
+                    request = Message(frame, value_type=int)
+                except ValueError:
+                    continue  # malformed frames are ignored, like a device would
+                response = self.server.forward(request)
+                if response is None:
+                    continue
+                try:
+                    self.request.sendall(response.encode("ascii"))
+                except OSError:
+                    return
+
+
+class Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(
+        self,
+        interface: Interface,
+        host: str = "127.0.0.1",
+        port: int = 10001,
+        max_age: float = 0.1,
+    ) -> None:
+        """
+        Serve a shared interface to local clients.
+
+        :param interface: Interface to the TECs, e.g. an XPort or USB connection
+        :param host: Address the server listens on
+        :param port: Port the server listens on. Use 0 to pick a free port
+        :param max_age: Maximum age in seconds of cached parameter values. 0 disables
+            caching
+        """
+        super().__init__((host, port), _Handler)
+        self.interface = interface
+        self.max_age = max_age
+        # (device_addr, parameter id and instance) → (timestamp, payload)
+        self._cache: Dict[Tuple[int, str], Tuple[float, str]] = {}
+        # reads of a parameter that are waiting for the interface
+        self._in_flight: Dict[Tuple[int, str], "Future[Optional[str]]"] = {}
+        # guards the cache only, so that cache hits do not wait for the interface
+        self._cache_lock = threading.Lock()
+
+    def forward(self, request: Message) -> Optional[str]:
+        """
+        Forward a request to the interface, answering reads from the cache.
+
+        :return: Response for the client or None if the request was not answered
+        """
+        cmd = request.payload
+        key = (request.device_addr, cmd[3:9])
+        if not cmd.startswith("?VR"):
+            payload = self._exchange(request, key)
+        else:
+            with self._cache_lock:
+                payload = self._cached(key)
+                in_flight = self._in_flight.get(key) if payload is None else None
+                if payload is None and in_flight is None:
+                    future: "Future[Optional[str]]" = Future()
+                    self._in_flight[key] = future
+            if payload is None and in_flight is not None:
+                payload = in_flight.result()  # another client reads the same value
+            elif payload is None:
+                try:
+                    payload = self._exchange(request, key)
+                finally:
+                    with self._cache_lock:
+                        del self._in_flight[key]
+                    future.set_result(payload)
+        if payload is None:
+            return None
+        return construct_response(request.device_addr, request.seq_num, payload)
+
+    def _exchange(self, request: Message, key: Tuple[int, str]) -> Optional[str]:
+        """Query the interface and update the cache with the response."""
+        cmd = request.payload
+        with get_lock(self.interface):
+            payload: Optional[str]
+            try:
+                payload = self.interface.query(request).payload
+            except MeComError as error:  # pass errors of the device on
+                payload = f"+{error.code:02X}"
+            except (OSError, ValueError):
+                # no or corrupted response, do not answer the client either
+                self.interface.clear()
+                payload = None
+            # updated while still holding the interface lock, so that a read can
+            # not store a value that a later write has already replaced
+            with self._cache_lock:
+                if not cmd.startswith("?VR"):
+                    self._invalidate(request)
+                elif payload is not None and not payload.startswith("+"):
+                    self._cache[key] = (time.monotonic(), payload)
+        return payload
+
+    def _cached(self, key: Tuple[int, str]) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        timestamp, payload = entry
+        if time.monotonic() - timestamp >= self.max_age:
+            return None
+        return payload
+
+    def _invalidate(self, request: Message) -> None:
+        """Drop cache entries that may be outdated by a write or reset request."""
+        cmd = request.payload
+        for device_addr, param in list(self._cache):
+            if request.device_addr not in (device_addr, BROADCAST_ADDR):
+                continue
+            if cmd.startswith("VS") and param != cmd[2:8]:
+                continue
+            self._cache.pop((device_addr, param), None)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m meer_tec.server",
+        description="Share a connection to Meerstetter TECs between local processes.",
+    )
+    upstream = parser.add_mutually_exclusive_group(required=True)
+    upstream.add_argument("--xport", help="IP address of the XPort")
+    upstream.add_argument("--usb", help="Serial port of the USB connection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=10001)
+    parser.add_argument("--max-age", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    interface: Interface
+    if args.xport:
+        from .interfaces import XPort
+
+        interface = XPort(args.xport)
+    else:
+        from .interfaces import USB
+
+        interface = USB(args.usb)
+
+    with Server(interface, args.host, args.port, args.max_age) as server:
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import collections
+import math
+import time
+from typing import TYPE_CHECKING, Deque, List, NamedTuple, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .tec import TEC
+
+
+class RollingStats:
+    def __init__(self, window: float) -> None:
+        """
+        Mean, standard deviation and slope of the samples within a time window.
+
+        Running sums are updated when samples enter or leave the window, so adding a
+        sample takes constant time independent of the number of samples.
+
+        :param window: Length of the window in seconds
+        """
+        self.window = window
+        self._samples: Deque[Tuple[float, float]] = collections.deque()
+        self._t0: Optional[float] = None
+        # sums of t, y, t², t·y and y² with t relative to the first sample
+        self._sums = [0.0] * 5
+
+    def add(self, t: float, y: float) -> None:
+        if self._t0 is None:
+            self._t0 = t
+        t -= self._t0
+        self._samples.append((t, y))
+        self._update(t, y, 1)
+        while t - self._samples[0][0] > self.window:
+            self._update(*self._samples.popleft(), -1)
+
+    def _update(self, t: float, y: float, sign: int) -> None:
+        for i, value in enumerate([t, y, t * t, t * y, y * y]):
+            self._sums[i] += sign * value
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def span(self) -> float:
+        """Time in seconds between the oldest and the newest sample in the window."""
+        if not self._samples:
+            return 0.0
+        return self._samples[-1][0] - self._samples[0][0]
+
+    @property
+    def mean(self) -> float:
+        if not self._samples:
+            return math.nan
+        return self._sums[1] / self.count
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation."""
+        if not self._samples:
+            return math.nan
+        variance = self._sums[4] / self.count - self.mean**2
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def slope(self) -> float:
+        """Slope of a linear fit in units per second."""
+        n = self.count
+        sum_t, sum_y, sum_tt, sum_ty, _ = self._sums
+        denominator = n * sum_tt - sum_t**2
+        if n < 2 or denominator <= 0:
+            return math.nan
+        return (n * sum_ty - sum_t * sum_y) / denominator
+
+
+class SettleResult(NamedTuple):
+    settled: bool
+    settle_time: float
+    samples: int
+    mean: float
+    std: float
+    slope: float
+    errors: int = 0
+
+
+class _Settling:
+    """Settling state of a single TEC."""
+
+    def __init__(self, tec: "TEC", channel: int, window: float) -> None:
+        self.tec = tec
+        self.channel = channel
+        self.stats = RollingStats(window)
+        self.target = tec.get_parameter(3000, value_type=float, param_inst=channel)
+        self.next_due = 0.0
+        self.samples = 0
+        self.errors = 0
+        self.result: Optional[SettleResult] = None
+
+    def sample(self) -> float:
+        """Read the object temperature and return the deviation from the target."""
+        temperature = self.tec.get_parameter(
+            1000, value_type=float, param_inst=self.channel
+        )
+        self.stats.add(time.monotonic(), temperature)
+        self.samples += 1
+        return abs(temperature - self.target)
+
+    def is_stable(self, deviation: float, tolerance: float, elapsed: float) -> bool:
+        stats = self.stats
+        return (
+            elapsed >= stats.window
+            and stats.count >= 3
+            and deviation <= tolerance
+            and abs(stats.mean - self.target) <= tolerance
+            and stats.std <= tolerance
+            and abs(stats.slope) * stats.window <= tolerance
+        )
+
+    def finish(self, settled: bool, elapsed: float) -> None:
+        stats = self.stats
+        self.result = SettleResult(
+            settled,
+            elapsed,
+            self.samples,
+            stats.mean,
+            stats.std,
+            stats.slope,
+            self.errors,
+        )
+
+
+def wait_until_stable_all(
+    tecs: Sequence["TEC"],
+    tolerance: float = 0.01,
+    window: float = 10.0,
+    timeout: float = 600.0,
+    channel: int = 1,
+    min_interval: float = 0.1,
+    max_interval: float = 5.0,
+) -> List[SettleResult]:
+    """
+    Wait until the object temperatures of several TECs are stable.
+
+    A TEC is considered stable if, over the last `window` seconds, the mean of its
+    object temperature is within `tolerance` of the target object temperature, the
+    standard deviation is below `tolerance` and the temperature drifts by less than
+    `tolerance` per window. The temperature is read more often the closer it is to the
+    target, from every `max_interval` seconds when far away down to every
+    `min_interval` seconds within the tolerance. A failed read is counted in the
+    `errors` of the result and retried after `max_interval` seconds.
+
+    :param tecs: TECs to wait for
+    :param tolerance: Tolerance in K
+    :param window: Time in seconds the temperature has to be stable. Should be several
+        times `min_interval`
+    :param timeout: Time in seconds after which to give up
+    :param channel: Channel of the TECs
+    :param min_interval: Minimum time in seconds between two reads of a TEC
+    :param max_interval: Maximum time in seconds between two reads of a TEC
+    :raises ValueError: If `tolerance` or `min_interval` is not positive or
+        `min_interval` exceeds `max_interval`
+    :return: Settling results, in the order of `tecs`
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+    if min_interval <= 0:
+        raise ValueError("min_interval must be positive")
+    if min_interval > max_interval:
+        raise ValueError("min_interval must not exceed max_interval")
+
+    start = time.monotonic()
+    settling = [_Settling(tec, channel, window) for tec in tecs]
+    waiting = list(settling)
+    while waiting:
+        state = min(waiting, key=lambda state: state.next_due)
+        if state.next_due > start + timeout:  # no sample is due before the timeout
+            time.sleep(max(start + timeout - time.monotonic(), 0))
+            for state in waiting:
+                state.finish(False, time.monotonic() - start)
+            break
+        delay = state.next_due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        try:
+            deviation = state.sample()
+        except (OSError, ValueError):
+            state.errors += 1
+            state.tec.clear()
+            deviation = math.inf  # retried after max_interval
+        now = time.monotonic()
+        elapsed = now - start
+        if state.is_stable(deviation, tolerance, elapsed):
+            state.finish(True, elapsed)
+            waiting.remove(state)
+        elif elapsed >= timeout:
+            for state in waiting:
+                state.finish(False, elapsed)
+            break
+        interval = min_interval * deviation / tolerance
+        state.next_due = now + min(max(interval, min_interval), max_interval)
+
+    return [state.result for state in settling if state.result is not None]
+
+
+def wait_until_stable(
+    tec: "TEC",
+    tolerance: float = 0.01,
+    window: float = 10.0,
+    timeout: float = 600.0,
+    channel: int = 1,
+    min_interval: float = 0.1,
+    max_interval: float = 5.0,
+) -> SettleResult:
+    """
+    Wait until the object temperature of a TEC is stable.
+
+    See :func:`wait_until_stable_all` for the arguments.
+    """
+    return wait_until_stable_all(
+        [tec], tolerance, window, timeout, channel, min_interval, max_interval
+    )[0]
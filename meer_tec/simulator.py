@@ -0,0 +1,164 @@
+"""
+Simulated MeCom devices behind local TCP endpoints that behave like an XPort.
+
+Useful to test and benchmark code using :class:`~meer_tec.tec.TEC` without
+hardware::
+
+    from meer_tec.interfaces import XPort
+    from meer_tec.simulator import SimulatedDevice, SimulatedXPort
+    from meer_tec.tec import TEC
+
+    endpoint = SimulatedXPort([SimulatedDevice(1), SimulatedDevice(2)], port=0)
+    endpoint.start()
+    tec = TEC(XPort(*endpoint.server_address), 1)
+"""
+import socketserver
+import struct
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from .mecom import BROADCAST_ADDR, Message, calc_checksum, construct_response
+from .protocol import split_frames
+
+# (param_id, param_inst) → value of a freshly started device
+DEFAULT_VALUES: Dict[Tuple[int, int], Union[int, float]] = {
+    (100, 1): 1091,  # device type
+    (101, 1): 100,  # hardware version
+    (102, 1): 12345,  # serial number
+    (103, 1): 400,  # firmware version
+    (104, 1): 2,  # device status: run
+    (105, 1): 0,  # error number
+    (1000, 1): 25.0,  # object temperature
+    (1001, 1): 30.0,  # sink temperature
+    (1010, 1): 25.0,  # target object temperature (read only)
+    (1020, 1): 0.5,  # actual output current
+    (1021, 1): 1.2,  # actual output voltage
+    (1200, 1): 2,  # temperature is stable
+    (2010, 1): 1,  # output stage status
+    (3000, 1): 25.0,  # target object temperature
+}
+
+
+def _encode(value: Union[int, float]) -> str:
+    if isinstance(value, float):
+        return f"{struct.unpack('>I', struct.pack('>f', value))[0]:08X}"
+    return f"{value:08X}"
+
+
+class SimulatedDevice:
+    def __init__(self, device_addr: int) -> None:
+        """
+        Device that stores parameters and answers ?VR, VS and RS requests.
+
+        :param device_addr: Device address (1 .. 255)
+        """
+        self.device_addr = device_addr
+        self.lock = threading.Lock()
+        self._values = {
+            param: _encode(value) for param, value in DEFAULT_VALUES.items()
+        }
+
+    def set_value(
+        self, param_id: int, value: Union[int, float], param_inst: int = 1
+    ) -> None:
+        with self.lock:
+            self._values[(param_id, param_inst)] = _encode(value)
+
+    def handle(self, request: Message) -> str:
+        """Process a request and return the response."""
+        cmd = request.payload
+        with self.lock:
+            if cmd.startswith("?VR"):
+                param = (int(cmd[3:7], 16), int(cmd[7:9], 16))
+                payload = self._values.get(param, "+05")
+            elif cmd.startswith("VS"):
+                param = (int(cmd[2:6], 16), int(cmd[6:8], 16))
+                if param in self._values:
+                    self._values[param] = cmd[8:16]
+                    payload = ""
+                else:
+                    payload = "+05"
+            elif cmd.startswith("RS"):
+                payload = ""
+            else:
+                payload = "+01"
+        return construct_response(self.device_addr, request.seq_num, payload)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "SimulatedXPort"
+
+    def handle(self) -> None:
+        buffer = bytearray()
+        while True:
+            try:
+                data = self.request.recv(1024)
+            except OSError:
+                return
+            if not data:
+                return
+            buffer += data
+            for frame in split_frames(buffer):
+                response = self.server.handle(frame)
+                if response is not None:
+                    self.request.sendall(response.encode("ascii"))
+
+
+class SimulatedXPort(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(
+        self,
+        devices: Sequence[SimulatedDevice],
+        host: str = "127.0.0.1",
+        port: int = 10001,
+        latency: float = 0.0,
+    ) -> None:
+        """
+        TCP endpoint with several simulated devices on one bus.
+
+        Like on a real bus, requests are handled one after another and requests to
+        unknown device addresses are not answered.
+
+        :param devices: Devices connected to the endpoint
+        :param host: Address the endpoint listens on
+        :param port: Port the endpoint listens on. Use 0 to pick a free port
+        :param latency: Time in seconds each request occupies the bus
+        """
+        super().__init__((host, port), _Handler)
+        self.devices = {device.device_addr: device for device in devices}
+        self.latency = latency
+        self.bus = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def handle(self, frame: str) -> Optional[str]:
+        """Process a request frame and return the response, if any."""
+        if frame[-5:-1] != calc_checksum(frame[:-5]):
+            return None  # corrupted requests are ignored by the devices
+        try:
+            request = Message(frame, value_type=int)
+        except ValueError:
+            return None
+        with self.bus:
+            if self.latency:
+                time.sleep(self.latency)
+            if request.device_addr == BROADCAST_ADDR:
+                responses = [dev.handle(request) for dev in self.devices.values()]
+                return "".join(responses)
+            device = self.devices.get(request.device_addr)
+            return None if device is None else device.handle(request)
+
+    def start(self) -> None:
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
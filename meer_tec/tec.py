@@ -1,7 +1,33 @@
-from typing import Optional, Type
-
-from .interfaces import Interface, Message
-from .mecom import FloatOrInt, construct_param_cmd, construct_reset_cmd, verify_response
+import struct
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
+
+from .interfaces import Interface, Message, get_lock, submit
+from .mecom import (
+    BROADCAST_ADDR,
+    FloatOrInt,
+    construct_param_cmd,
+    construct_reset_cmd,
+    verify_response,
+)
+from .settle import SettleResult, wait_until_stable, wait_until_stable_all
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+T = TypeVar("T")
 
 
 class TEC:
@@ -10,7 +36,14 @@ class TEC:
         self.device_addr = device_addr
 
     def clear(self) -> None:
-        self.interface.clear()
+        with get_lock(self.interface):
+            self.interface.clear()
+
+    def query(self, request: Message) -> Message:
+        """Send a request and return the response, holding the interface lock."""
+        with get_lock(self.interface):
+            response = self.interface.query(request)
+        return Message(response, value_type=request.value_type)
 
     def get_parameter(
         self,
@@ -30,7 +63,7 @@ class TEC:
         )
         request = Message(cmd, value_type)
 
-        reponse = Message(self.interface.query(request), value_type=value_type)
+        reponse = self.query(request)
         return reponse.value
 
     def set_parameter(
@@ -51,18 +84,71 @@ class TEC:
             seq_num=seq_num,
         )
         request = Message(cmd, value_type)
-        reponse = Message(self.interface.query(request), value_type=value_type)
+        reponse = self.query(request)
         if not verify_response(reponse, request):
             raise ValueError("Response does not match request")
-        print(reponse)
 
     def reset(self) -> None:
         cmd = construct_reset_cmd(device_addr=self.device_addr)
         request = Message(cmd, value_type=int)
-        reponse = Message(self.interface.query(request), value_type=int)
+        reponse = self.query(request)
         if not verify_response(reponse, request):
             raise ValueError("Response does not match request")
 
+    def submit_get(
+        self, param_id: int, value_type: Type[FloatOrInt], param_inst: int = 1
+    ) -> "Future[FloatOrInt]":
+        """Read a parameter on the worker thread of the interface."""
+        return submit(
+            self.interface,
+            self.get_parameter,
+            param_id,
+            value_type,
+            param_inst=param_inst,
+        )
+
+    def submit_set(
+        self,
+        param_id: int,
+        value: FloatOrInt,
+        value_type: Type[FloatOrInt],
+        param_inst: int = 1,
+    ) -> "Future[None]":
+        """Set a parameter on the worker thread of the interface."""
+        return submit(
+            self.interface,
+            self.set_parameter,
+            param_id,
+            value,
+            value_type,
+            param_inst=param_inst,
+        )
+
+    def wait_until_stable(
+        self,
+        tolerance: float = 0.01,
+        window: float = 10.0,
+        timeout: float = 600.0,
+        channel: int = 1,
+        min_interval: float = 0.1,
+        max_interval: float = 5.0,
+    ) -> SettleResult:
+        """
+        Wait until the object temperature is stable.
+
+        :param tolerance: Tolerance in K
+        :param window: Time in seconds the temperature has to be stable. Should be
+            several times `min_interval`
+        :param timeout: Time in seconds after which to give up
+        :param channel: Channel of the TEC
+        :param min_interval: Minimum time in seconds between two reads
+        :param max_interval: Maximum time in seconds between two reads
+        :return: Settling result, see :func:`meer_tec.settle.wait_until_stable_all`
+        """
+        return wait_until_stable(
+            self, tolerance, window, timeout, channel, min_interval, max_interval
+        )
+
     # Common product parameters
 
     @property
@@ -619,3 +705,182 @@ class TEC:
     @positive_current_is_ch2.setter
     def positive_current_is_ch2(self, value: int) -> None:
         self.set_parameter(3034, value, value_type=int, param_inst=2)
+
+
+class TECGroup:
+    def __init__(self, tecs: Sequence[TEC]) -> None:
+        """
+        Several TECs that are read and written together.
+
+        The TECs may be connected via different interfaces. Interfaces are served in
+        parallel, TECs sharing an interface one after another.
+
+        :param tecs: TECs of the group
+        """
+        self.tecs = list(tecs)
+
+    @property
+    def interfaces(self) -> List[Interface]:
+        interfaces: Dict[int, Interface] = {}
+        for tec in self.tecs:
+            interfaces.setdefault(id(tec.interface), tec.interface)
+        return list(interfaces.values())
+
+    def get_parameter(
+        self, param_id: int, value_type: Type[FloatOrInt], param_inst: int = 1
+    ) -> List[FloatOrInt]:
+        """Read a parameter of all TECs, in the order of :attr:`tecs`."""
+
+        def read(tecs: List[TEC]) -> List[FloatOrInt]:
+            return [
+                tec.get_parameter(param_id, value_type, param_inst=param_inst)
+                for tec in tecs
+            ]
+
+        return self._per_interface(read)
+
+    def set_parameter(
+        self,
+        param_id: int,
+        value: FloatOrInt,
+        value_type: Type[FloatOrInt],
+        param_inst: int = 1,
+        broadcast: bool = False,
+        verify: bool = False,
+        settle: float = 0.05,
+    ) -> None:
+        """
+        Set a parameter of all TECs to the same value.
+
+        :param param_id: Parameter ID (0 .. 65535)
+        :param value: Value to set
+        :param value_type: Value type (int or float)
+        :param param_inst: Parameter instance (0 .. 255)
+        :param broadcast: Send a single frame with the Broadcast Device Address (0)
+            per interface instead of one frame per TEC. Note that this sets the
+            parameter of all devices connected to the interfaces, not only of the
+            TECs in the group. The acknowledgements of several devices on one bus
+            collide, they are discarded after `settle` seconds and not verified
+        :param verify: Read the parameter of all TECs afterwards and raise a
+            ValueError if it does not match `value`
+        :param settle: Time in seconds to wait for the acknowledgements of a
+            broadcast before discarding them
+        """
+        if broadcast:
+            cmd = construct_param_cmd(
+                device_addr=BROADCAST_ADDR,
+                cmd="VS",
+                param_id=param_id,
+                value_type=value_type,
+                param_inst=param_inst,
+                value=value,
+            )
+            request = Message(cmd, value_type)
+
+            def write(tecs: List[TEC]) -> List[None]:
+                interface = tecs[0].interface
+                with get_lock(interface):
+                    interface.transmit(request)
+                    time.sleep(settle)
+                    interface.clear()
+                return [None] * len(tecs)
+
+            self._per_interface(write)
+        else:
+
+            def write(tecs: List[TEC]) -> List[None]:
+                for tec in tecs:
+                    tec.set_parameter(
+                        param_id, value, value_type, param_inst=param_inst
+                    )
+                return [None] * len(tecs)
+
+            self._per_interface(write)
+
+        if verify:
+            expected: Any = value
+            if value_type is float:  # the value is transmitted with single precision
+                expected = struct.unpack("<f", struct.pack("<f", value))[0]
+            values = self.get_parameter(param_id, value_type, param_inst=param_inst)
+            failed = [
+                tec.device_addr
+                for tec, actual in zip(self.tecs, values)
+                if actual != expected
+            ]
+            if failed:
+                raise ValueError(
+                    f"Parameter {param_id} was not set on devices {failed}"
+                )
+
+    def wait_until_stable(
+        self,
+        tolerance: float = 0.01,
+        window: float = 10.0,
+        timeout: float = 600.0,
+        channel: int = 1,
+        min_interval: float = 0.1,
+        max_interval: float = 5.0,
+    ) -> List[SettleResult]:
+        """
+        Wait until the object temperatures of all TECs are stable.
+
+        See :meth:`TEC.wait_until_stable` for the arguments.
+        """
+        return wait_until_stable_all(
+            self.tecs, tolerance, window, timeout, channel, min_interval, max_interval
+        )
+
+    def _per_interface(self, func: Callable[[List[TEC]], List[Any]]) -> List[Any]:
+        """Call `func` with the TECs of each interface on the interface's worker."""
+        groups: Dict[int, List[int]] = {}
+        for i, tec in enumerate(self.tecs):
+            groups.setdefault(id(tec.interface), []).append(i)
+
+        futures = [
+            submit(self.tecs[group[0]].interface, func, [self.tecs[i] for i in group])
+            for group in groups.values()
+        ]
+        results: List[Any] = [None] * len(self.tecs)
+        errors: List[BaseException] = []
+        for group, future in zip(groups.values(), futures):
+            error = future.exception()  # wait for all interfaces, even after an error
+            if error is not None:
+                errors.append(error)
+                continue
+            for i, value in zip(group, future.result()):
+                results[i] = value
+        if errors:
+            raise errors[0]
+        return results
+
+
+def map_tecs(
+    func: Callable[[TEC], T], tecs: Iterable[TEC], timeout: Optional[float] = None
+) -> Iterator[T]:
+    """
+    Call a function for many TECs, like :meth:`concurrent.futures.Executor.map`.
+
+    Each call runs on the worker thread of the interface of the TEC, so TECs on
+    different interfaces are served in parallel.
+
+    :param func: Function called with each TEC, e.g. ``lambda tec: tec.status``
+    :param tecs: TECs to call the function for
+    :param timeout: Time in seconds after which results that are not available
+        raise a TimeoutError. No limit if not given
+    :return: Results, in the order of `tecs`
+    """
+    end_time = None if timeout is None else time.monotonic() + timeout
+    futures = [submit(tec.interface, func, tec) for tec in tecs]
+
+    def results() -> Iterator[T]:
+        try:
+            for future in futures:
+                if end_time is None:
+                    yield future.result()
+                else:
+                    yield future.result(end_time - time.monotonic())
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return results()
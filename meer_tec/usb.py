@@ -0,0 +1,82 @@
+import sys
+import time
+
+import serial
+
+from .mecom import Message
+from .protocol import MAX_FRAME_LENGTH, TERMINATOR, MeComProtocol, find_response
+
+
+class USB(serial.Serial):
+    def __init__(
+        self,
+        port: str,
+        timeout: float = 1,
+        baudrate: int = 57600,
+        low_latency: bool = False,
+        inter_byte_timeout: float = 0.01,
+    ) -> None:
+        """
+        Serial connection to a TEC, e.g. via its USB port.
+
+        :param port: Serial port, e.g. "COM3" or "/dev/ttyUSB0"
+        :param timeout: Time in seconds to wait for a response
+        :param baudrate: Baud rate, has to match the setting of the device. Higher
+            baud rates such as 115200, 230400 or 921600 reduce the round-trip time
+        :param low_latency: Do not wait before reading the response and return as
+            soon as it is complete. On Linux, the driver is asked to hand over
+            received data immediately (ASYNC_LOW_LATENCY) instead of buffering it
+        :param inter_byte_timeout: Interval in seconds at which received data is
+            polled in low-latency mode. Gaps within a response, e.g. due to the
+            latency timer of USB-serial bridges, are waited for until `timeout`
+        """
+        self.low_latency = low_latency
+        self.response_timeout = timeout
+        self.protocol = MeComProtocol()
+        super().__init__(
+            port,
+            baudrate=baudrate,
+            # in low-latency mode, reads are polled with the inter-byte timeout
+            timeout=inter_byte_timeout if low_latency else timeout,
+            write_timeout=timeout,
+        )
+        if low_latency and sys.platform != "win32":
+            try:
+                self.set_low_latency_mode(True)
+            except (AttributeError, NotImplementedError, ValueError):
+                pass  # not supported by the platform or driver
+
+    def query(self, request: Message) -> Message:
+        self.transmit(request)
+        if not self.low_latency:
+            time.sleep(0.01)
+        return self.receive(request)
+
+    def transmit(self, request: Message) -> None:
+        """Send a request without waiting for the response."""
+        self.write(self.protocol.send(request))
+
+    def receive(self, request: Message) -> Message:
+        """Receive the response to a request, skipping responses to other requests."""
+        deadline = time.monotonic() + self.response_timeout
+        try:
+            while True:
+                if self.low_latency:
+                    data = self.read(self.in_waiting or 1)
+                else:
+                    data = self.read_until(TERMINATOR, MAX_FRAME_LENGTH)
+                if data:
+                    events = self.protocol.receive_data(data)
+                    response = find_response(events, request)
+                    if response is not None:
+                        return response
+                # in low-latency mode, reads return empty after the poll interval,
+                # both while waiting for a response and within a response
+                elif not self.low_latency or time.monotonic() > deadline:
+                    raise TimeoutError("No response from the device")
+        finally:
+            self.protocol.forget(request)
+
+    def clear(self) -> None:
+        self.reset_input_buffer()
+        self.protocol.clear()
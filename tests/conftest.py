@@ -0,0 +1,102 @@
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Set, Tuple
+
+import pytest
+
+from meer_tec.mecom import BROADCAST_ADDR, Message, construct_response
+from meer_tec.protocol import MeComProtocol, find_response
+
+
+class FakeInterface:
+    """Interface answering MeCom requests like a set of devices would."""
+
+    def __init__(
+        self,
+        ignore_writes: bool = False,
+        delay: float = 0.0,
+        fail_addrs: Iterable[int] = (),
+    ) -> None:
+        """
+        :param ignore_writes: Acknowledge writes without changing any value
+        :param delay: Time in seconds each query takes
+        :param fail_addrs: Device addresses that do not answer queries
+        """
+        self.ignore_writes = ignore_writes
+        self.delay = delay
+        self.fail_addrs = set(fail_addrs)
+        # threads that queried the interface and the most simultaneous queries
+        self.threads: Set[threading.Thread] = set()
+        self.max_concurrent = 0
+        self._concurrent = 0
+        self._lock = threading.Lock()
+        # (device_addr, param_id, param_inst) → hex encoded value
+        self.values: Dict[Tuple[int, int, int], str] = {}
+        self.requests: List[Message] = []
+        self.protocol = MeComProtocol()
+
+    def set_value(
+        self, device_addr: int, param_id: int, value: float, param_inst: int = 1
+    ) -> None:
+        if isinstance(value, float):
+            payload = struct.pack("!f", value).hex().upper()
+        else:
+            payload = f"{value:08X}"
+        self.values[(device_addr, param_id, param_inst)] = payload
+
+    def query(self, request: Message) -> Message:
+        with self._lock:
+            self.threads.add(threading.current_thread())
+            self._concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self._concurrent)
+        try:
+            time.sleep(self.delay)
+            if request.device_addr in self.fail_addrs:
+                raise TimeoutError("No response from the device")
+            return self._query(request)
+        finally:
+            with self._lock:
+                self._concurrent -= 1
+
+    def _query(self, request: Message) -> Message:
+        data = self.protocol.send(request)
+        events = self.protocol.receive_data(self.respond(data).encode("ascii"))
+        self.protocol.forget(request)
+        response = find_response(events, request)
+        if response is None:
+            raise TimeoutError("No response from the device")
+        return response
+
+    def transmit(self, request: Message) -> None:
+        self.respond(self.protocol.send(request))
+
+    def clear(self) -> None:
+        self.protocol.clear()
+
+    def respond(self, data: bytes) -> str:
+        """Process a request like the devices would and return the response."""
+        request = Message(data.decode("ascii"), value_type=int)
+        self.requests.append(request)
+        cmd = request.payload
+        if cmd.startswith("?VR"):
+            key = (request.device_addr, int(cmd[3:7], 16), int(cmd[7:9], 16))
+            payload = self.values.get(key, "+05")
+        elif cmd.startswith("VS"):
+            param = (int(cmd[2:6], 16), int(cmd[6:8], 16))
+            if request.device_addr == BROADCAST_ADDR:
+                device_addrs = {device_addr for device_addr, *_ in self.values}
+            else:
+                device_addrs = {request.device_addr}
+            for device_addr in device_addrs:
+                if not self.ignore_writes:
+                    self.values[(device_addr, *param)] = cmd[8:16]
+            payload = ""
+        else:
+            payload = ""
+        return construct_response(request.device_addr, request.seq_num, payload)
+
+
+@pytest.fixture
+def fake_interface() -> FakeInterface:
+    return FakeInterface()
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+from typing import Dict
+
+# generous upper limit for the cumulative import time of meer_tec.tec in µs, only
+# meant to catch heavy dependencies being imported at module level again
+IMPORT_TIME_BUDGET = 200_000
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Cumulative import times in µs as reported by ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_no_pyserial_without_usb() -> None:
+    for module in ["meer_tec.mecom", "meer_tec.interfaces", "meer_tec.tec"]:
+        assert "serial" not in import_times(module)
+
+
+def test_no_concurrent_futures_at_import() -> None:
+    assert "concurrent.futures" not in import_times("meer_tec.tec")
+
+
+def test_import_time() -> None:
+    assert import_times("meer_tec.tec")["meer_tec.tec"] < IMPORT_TIME_BUDGET
@@ -61,3 +61,10 @@ def test_reset() -> None:
     CMD = "#7B3039RSB5BB\r"
     cmd = construct_reset_cmd(device_addr=123, seq_num=12345)
     assert cmd == CMD
+
+
+def test_vs_float_zero() -> None:
+    cmd = construct_param_cmd(
+        device_addr=1, cmd="VS", param_id=3000, value_type=float, value=0.0, seq_num=1
+    )
+    assert cmd[15:23] == "00000000"
@@ -0,0 +1,157 @@
+import random
+
+import pytest
+
+from meer_tec.mecom import (
+    MeComError,
+    Message,
+    calc_checksum,
+    construct_param_cmd,
+    construct_response,
+)
+from meer_tec.protocol import (
+    MAX_FRAME_LENGTH,
+    DeviceError,
+    InvalidFrame,
+    MeComProtocol,
+    Response,
+    UnexpectedResponse,
+    find_response,
+)
+
+
+def request(seq_num: int) -> Message:
+    cmd = construct_param_cmd(5, "?VR", 1000, float, seq_num=seq_num)
+    return Message(cmd, value_type=float)
+
+
+def test_response_in_chunks() -> None:
+    protocol = MeComProtocol()
+    req = request(1)
+    assert protocol.send(req) == req.encode("ascii")
+    data = construct_response(5, 1, "41B40000").encode("ascii")
+    for byte in data[:-1]:
+        assert protocol.receive_data(bytes([byte])) == []
+    assert protocol.buffered == len(data) - 1
+    (event,) = protocol.receive_data(data[-1:])
+    assert isinstance(event, Response)
+    assert event.request is req
+    assert event.response.value == 22.5
+    assert protocol.pending == []
+    assert protocol.buffered == 0
+
+
+def test_pipelined_responses() -> None:
+    protocol = MeComProtocol()
+    requests = [request(seq_num) for seq_num in [1, 2, 3]]
+    for req in requests:
+        protocol.send(req)
+    data = "".join(construct_response(5, seq, "") for seq in [3, 1, 2])
+    events = protocol.receive_data(data.encode("ascii"))
+    assert [event.request for event in events if isinstance(event, Response)] == [
+        requests[2],
+        *requests[:2],
+    ]
+    assert find_response(events, requests[0]) == construct_response(5, 1, "")
+
+
+def test_checksum_mismatch() -> None:
+    protocol = MeComProtocol()
+    req = request(1)
+    protocol.send(req)
+    data = construct_response(5, 1, "41B40000").replace("41B4", "41B5")
+    (event,) = protocol.receive_data(data.encode("ascii"))
+    assert isinstance(event, InvalidFrame)
+    assert protocol.pending == [req]
+    with pytest.raises(ValueError):
+        find_response([event], req)
+
+
+@pytest.mark.parametrize("data", [b"garbage\r", b"\r", b"#0100?VR\r"])
+def test_malformed_frame(data: bytes) -> None:
+    (event,) = MeComProtocol().receive_data(data)
+    assert isinstance(event, InvalidFrame)
+
+
+def test_unexpected_response_is_skipped() -> None:
+    protocol = MeComProtocol()
+    req = request(2)
+    protocol.send(req)
+    data = construct_response(5, 1, "") + construct_response(5, 2, "41B40000")
+    events = protocol.receive_data(data.encode("ascii"))
+    assert isinstance(events[0], UnexpectedResponse)
+    assert find_response(events, req) == construct_response(5, 2, "41B40000")
+
+
+def test_device_error() -> None:
+    protocol = MeComProtocol()
+    req = request(1)
+    protocol.send(req)
+    (event,) = protocol.receive_data(construct_response(5, 1, "+05").encode("ascii"))
+    assert isinstance(event, DeviceError)
+    assert event.code == 5
+    with pytest.raises(MeComError) as error:
+        find_response([event], req)
+    assert error.value.code == 5
+
+
+def test_clear() -> None:
+    protocol = MeComProtocol()
+    protocol.send(request(1))
+    protocol.receive_data(b"!0500")
+    protocol.clear()
+    assert protocol.pending == []
+    assert protocol.buffered == 0
+
+
+def test_forget() -> None:
+    protocol = MeComProtocol()
+    req = request(1)
+    protocol.send(req)
+    protocol.forget(req)
+    assert protocol.pending == []
+    (event,) = protocol.receive_data(construct_response(5, 1, "").encode("ascii"))
+    assert isinstance(event, UnexpectedResponse)
+
+
+def test_noise_without_terminator() -> None:
+    protocol = MeComProtocol()
+    assert protocol.receive_data(b"x" * MAX_FRAME_LENGTH) == []
+    (event,) = protocol.receive_data(b"x")
+    assert isinstance(event, InvalidFrame)
+    assert protocol.buffered == 0
+
+
+def test_resync_after_truncated_frame() -> None:
+    protocol = MeComProtocol()
+    req = request(1)
+    protocol.send(req)
+    data = b"!01000" + construct_response(5, 1, "41B40000").encode("ascii")
+    events = protocol.receive_data(data)
+    assert isinstance(events[0], InvalidFrame)
+    assert find_response(events, req) == construct_response(5, 1, "41B40000")
+
+
+def test_non_hex_address() -> None:
+    frame = "!ZZ0001"
+    data = f"{frame}{calc_checksum(frame)}\r".encode("ascii")
+    (event,) = MeComProtocol().receive_data(data)
+    assert isinstance(event, InvalidFrame)
+
+
+def test_fuzz() -> None:
+    rng = random.Random(0)
+    protocol = MeComProtocol()
+    for seq_num in range(500):
+        req = request(seq_num)
+        protocol.send(req)
+        junk = bytes(rng.choices(b"!\r0123456789ABCDEFZ+", k=rng.randrange(300)))
+        response = construct_response(5, seq_num, "41B40000")
+        data = junk + response.encode("ascii")
+        events = []
+        while data:  # received in chunks of random size
+            size = rng.randrange(1, 64)
+            events += protocol.receive_data(data[:size])
+            data = data[size:]
+        assert find_response(events, req) == response
+        assert protocol.buffered == 0
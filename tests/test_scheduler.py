@@ -0,0 +1,50 @@
+from meer_tec.scheduler import Scheduler
+from meer_tec.tec import TEC
+from tests.conftest import FakeInterface
+
+
+def test_rates_and_priorities() -> None:
+    interface = FakeInterface(delay=0.005)
+    interface.set_value(1, 1000, 21.0)
+    interface.set_value(1, 1020, 1.5)
+    interface.set_value(1, 103, 123)
+    tec = TEC(interface, 1)
+
+    scheduler = Scheduler()
+    critical = scheduler.add(tec, 1000, float, rate=50, priority=1)
+    bulk = scheduler.add(tec, 1020, float, rate=500)
+    once = scheduler.add(tec, 103, int, rate=0)
+    scheduler.run(duration=0.5)
+
+    assert once.count == 1
+    assert once.value == 123
+    assert critical.value == 21.0
+    assert bulk.value == 1.5
+    assert scheduler.link_rtt(tec.interface) is not None
+    shortfall = scheduler.shortfall()
+    assert critical not in shortfall
+    assert shortfall[bulk] > 0
+    assert critical.achieved_rate > 30
+
+
+def test_errors_are_counted(fake_interface) -> None:
+    tec = TEC(fake_interface, 1)  # parameter not present, device answers with error
+    scheduler = Scheduler()
+    task = scheduler.add(tec, 1000, float, rate=10)
+    scheduler.run(duration=0.05)
+    assert task.errors >= 1
+    assert task.count == 0
+
+
+def test_failing_callback_keeps_link_running(fake_interface) -> None:
+    fake_interface.set_value(1, 1000, 21.0)
+
+    def callback(task) -> None:
+        raise RuntimeError("callback failed")
+
+    scheduler = Scheduler()
+    task = scheduler.add(TEC(fake_interface, 1), 1000, float, 100, callback=callback)
+    scheduler.run(duration=0.1)
+    assert task.count > 1
+    assert task.errors == task.count
+    assert isinstance(task.last_error, RuntimeError)
@@ -0,0 +1,117 @@
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Tuple
+
+import pytest
+
+from meer_tec.interfaces import XPort
+from meer_tec.mecom import MeComError
+from meer_tec.server import Server
+from meer_tec.tec import TEC
+from tests.conftest import FakeInterface
+
+
+@pytest.fixture
+def server(fake_interface) -> Iterator[Tuple[Server, int]]:
+    server = Server(fake_interface, port=0, max_age=10)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_read_through_server(server, fake_interface) -> None:
+    _, port = server
+    fake_interface.set_value(12, 1000, 23.5)
+    tec = TEC(XPort("127.0.0.1", port), 12)
+    assert tec.object_temperature == 23.5
+
+
+def test_reads_are_cached(server, fake_interface) -> None:
+    _, port = server
+    fake_interface.set_value(3, 1000, 20.0)
+    tec_a = TEC(XPort("127.0.0.1", port), 3)
+    tec_b = TEC(XPort("127.0.0.1", port), 3)
+    assert tec_a.object_temperature == 20.0
+    assert tec_b.object_temperature == 20.0
+    assert len(fake_interface.requests) == 1
+
+
+def test_write_invalidates_cache(server, fake_interface) -> None:
+    _, port = server
+    fake_interface.set_value(3, 3000, 20.0)
+    tec = TEC(XPort("127.0.0.1", port), 3)
+    assert tec.target_object_temperature == 20.0
+    tec.target_object_temperature = 25.0
+    assert tec.target_object_temperature == 25.0
+
+
+def test_device_errors_are_passed_on(server) -> None:
+    _, port = server
+    tec = TEC(XPort("127.0.0.1", port), 3)
+    with pytest.raises(MeComError) as error:
+        tec.object_temperature
+    assert error.value.code == 5
+
+
+def test_unanswered_request_keeps_connection() -> None:
+    fake_interface = FakeInterface(fail_addrs=[99])
+    fake_interface.set_value(3, 1000, 20.0)
+    with Server(fake_interface, port=0) as server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        xport = XPort("127.0.0.1", server.server_address[1])
+        with pytest.raises(TimeoutError):
+            TEC(xport, 99).object_temperature
+        assert TEC(xport, 3).object_temperature == 20.0
+        server.shutdown()
+
+
+def test_concurrent_reads_share_one_exchange(server, fake_interface) -> None:
+    _, port = server
+    fake_interface.set_value(3, 1000, 20.0)
+    fake_interface.delay = 0.05
+    tecs = [TEC(XPort("127.0.0.1", port), 3) for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        values = list(executor.map(lambda tec: tec.object_temperature, tecs))
+    assert values == [20.0] * 4
+    assert len(fake_interface.requests) == 1
+
+
+def test_cache_hit_does_not_wait_for_interface(server, fake_interface) -> None:
+    _, port = server
+    fake_interface.set_value(3, 1000, 20.0)
+    tec = TEC(XPort("127.0.0.1", port), 3)
+    assert tec.object_temperature == 20.0
+    # a slow exchange with an absent device occupies the interface
+    fake_interface.delay = 0.5
+    fake_interface.fail_addrs.add(99)
+    absent = TEC(XPort("127.0.0.1", port), 99)
+    errors = []
+
+    def read_absent() -> None:
+        try:
+            absent.object_temperature
+        except TimeoutError as error:
+            errors.append(error)
+
+    reader = threading.Thread(target=read_absent)
+    reader.start()
+    time.sleep(0.05)
+    assert tec.object_temperature == 20.0  # within the 0.2 s XPort timeout
+    reader.join()
+    assert errors
+
+
+def test_client_reset(server, fake_interface, capsys) -> None:
+    _, port = server
+    client = socket.create_connection(("127.0.0.1", port))
+    client.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+    client.close()  # resets the connection
+    fake_interface.set_value(3, 1000, 20.0)
+    assert TEC(XPort("127.0.0.1", port), 3).object_temperature == 20.0
+    time.sleep(0.05)
+    assert "Traceback" not in capsys.readouterr().err
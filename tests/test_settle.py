@@ -0,0 +1,83 @@
+import statistics
+import threading
+import time
+
+import pytest
+
+from meer_tec.settle import RollingStats
+from meer_tec.tec import TEC, TECGroup
+from tests.conftest import FakeInterface
+
+
+def test_rolling_stats() -> None:
+    stats = RollingStats(window=10)
+    samples = [(100.0 + t, 20.0 + 0.5 * t + (-1) ** t * 0.1) for t in range(30)]
+    for t, y in samples:
+        stats.add(t, y)
+    in_window = [y for t, y in samples if t >= 119]
+    assert stats.count == len(in_window) == 11
+    assert stats.span == 10
+    assert stats.mean == pytest.approx(statistics.mean(in_window))
+    assert stats.std == pytest.approx(statistics.pstdev(in_window))
+    assert stats.slope == pytest.approx(0.5, abs=0.01)
+
+
+@pytest.fixture
+def tecs() -> list:
+    interface = FakeInterface()
+    for device_addr, temperature in [(1, 25.0), (2, 25.005), (3, 30.0)]:
+        interface.set_value(device_addr, 3000, 25.0)
+        interface.set_value(device_addr, 1000, temperature)
+    return [TEC(interface, device_addr) for device_addr in [1, 2, 3]]
+
+
+def test_wait_until_stable(tecs) -> None:
+    result = tecs[0].wait_until_stable(
+        tolerance=0.01, window=0.05, timeout=1, min_interval=0.005, max_interval=0.1
+    )
+    assert result.settled
+    assert 0.05 <= result.settle_time < 1
+    assert result.mean == 25.0
+    assert result.std == 0
+
+
+def test_wait_until_stable_group(tecs) -> None:
+    results = TECGroup(tecs).wait_until_stable(
+        tolerance=0.01, window=0.05, timeout=0.5, min_interval=0.005, max_interval=0.1
+    )
+    assert [result.settled for result in results] == [True, True, False]
+    assert results[2].settle_time >= 0.5
+    # the TEC far away from its target is read less often
+    assert results[2].samples < results[0].samples
+
+
+def test_timeout_caps_sleep(tecs) -> None:
+    start = time.monotonic()
+    result = tecs[2].wait_until_stable(window=0.05, timeout=0.1, max_interval=5)
+    assert time.monotonic() - start < 1
+    assert not result.settled
+    assert result.samples == 1
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"tolerance": 0}, {"min_interval": 0}, {"min_interval": 1, "max_interval": 0.5}],
+)
+def test_invalid_arguments(tecs, kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        tecs[0].wait_until_stable(**kwargs)
+
+
+def test_failed_reads_are_retried() -> None:
+    interface = FakeInterface()
+    interface.set_value(1, 3000, 25.0)
+    # the object temperature is not available at first, the device answers with an
+    # error until it is set
+    timer = threading.Timer(0.05, interface.set_value, args=(1, 1000, 25.0))
+    timer.start()
+    result = TEC(interface, 1).wait_until_stable(
+        window=0.05, timeout=1, min_interval=0.005, max_interval=0.02
+    )
+    timer.join()
+    assert result.settled
+    assert result.errors > 0
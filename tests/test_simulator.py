@@ -0,0 +1,52 @@
+from typing import Iterator, List
+
+import pytest
+
+from meer_tec.interfaces import XPort
+from meer_tec.mecom import MeComError
+from meer_tec.simulator import SimulatedDevice, SimulatedXPort
+from meer_tec.tec import TEC, TECGroup, map_tecs
+
+
+@pytest.fixture
+def endpoints() -> Iterator[List[SimulatedXPort]]:
+    endpoints = []
+    for link in range(2):
+        devices = [SimulatedDevice(10 * link + i) for i in range(1, 4)]
+        endpoint = SimulatedXPort(devices, port=0)
+        endpoint.start()
+        endpoints.append(endpoint)
+    yield endpoints
+    for endpoint in endpoints:
+        endpoint.stop()
+
+
+@pytest.fixture
+def tecs(endpoints) -> List[TEC]:
+    tecs = []
+    for endpoint in endpoints:
+        xport = XPort(*endpoint.server_address)
+        tecs += [TEC(xport, device_addr) for device_addr in endpoint.devices]
+    return tecs
+
+
+def test_read_write(tecs) -> None:
+    tec = tecs[0]
+    assert tec.device_type == 1091
+    assert tec.object_temperature == 25.0
+    tec.target_object_temperature = 20.5
+    assert tec.target_object_temperature == 20.5
+    with pytest.raises(MeComError):
+        tec.get_parameter(9999, int)
+
+
+def test_unknown_device_does_not_answer(endpoints) -> None:
+    tec = TEC(XPort(*endpoints[0].server_address), 99)
+    with pytest.raises(TimeoutError):
+        tec.object_temperature
+
+
+def test_fleet(tecs) -> None:
+    temperatures = map_tecs(lambda tec: tec.object_temperature, tecs)
+    assert list(temperatures) == [25.0] * 6
+    TECGroup(tecs).set_parameter(3000, 18.0, float, broadcast=True, verify=True)
@@ -1,3 +1,78 @@
-from meer_tec.tec import TEC  # noqa F401
+from concurrent.futures import ThreadPoolExecutor
 
-# TODO: Implement some tests. Only have this so code coverage is calculated correctly.
+import pytest
+
+from meer_tec.tec import TEC, TECGroup, map_tecs
+from tests.conftest import FakeInterface
+
+
+@pytest.fixture
+def group() -> TECGroup:
+    interfaces = [FakeInterface(), FakeInterface()]
+    tecs = []
+    for device_addr in [1, 2, 3, 4]:
+        interface = interfaces[device_addr % 2]
+        interface.set_value(device_addr, 3000, 20.0 + device_addr)
+        tecs.append(TEC(interface, device_addr))
+    return TECGroup(tecs)
+
+
+def test_group_get_parameter(group) -> None:
+    assert group.get_parameter(3000, float) == [21.0, 22.0, 23.0, 24.0]
+
+
+@pytest.mark.parametrize("broadcast", [False, True])
+def test_group_set_parameter(group, broadcast: bool) -> None:
+    group.set_parameter(3000, 25.1, float, broadcast=broadcast, verify=True, settle=0)
+    requests = [len(interface.requests) for interface in group.interfaces]
+    # one frame per interface instead of one per TEC, followed by the verification
+    assert requests == ([1 + 2] * 2 if broadcast else [2 + 2] * 2)
+    assert group.get_parameter(3000, float) == [pytest.approx(25.1)] * 4
+
+
+def test_group_verify_fails(group) -> None:
+    interface = FakeInterface(ignore_writes=True)
+    interface.set_value(5, 3000, 20.0)
+    group.tecs.append(TEC(interface, 5))
+    with pytest.raises(ValueError):
+        group.set_parameter(3000, 25.0, float, verify=True)
+
+
+def test_thread_safe() -> None:
+    interface = FakeInterface(delay=0.001)
+    interface.set_value(1, 1000, 21.0)
+    tec = TEC(interface, 1)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(lambda: tec.object_temperature) for _ in range(32)]
+        assert [future.result() for future in futures] == [21.0] * 32
+    assert interface.max_concurrent == 1
+
+
+def test_submit(fake_interface) -> None:
+    tec = TEC(fake_interface, 1)
+    tec.submit_set(3000, 22.0, float).result()
+    assert tec.submit_get(3000, float).result() == 22.0
+
+
+def test_map_tecs(group) -> None:
+    results = map_tecs(lambda tec: tec.target_object_temperature, group.tecs)
+    assert list(results) == [21.0, 22.0, 23.0, 24.0]
+
+
+def test_group_uses_interface_worker(group) -> None:
+    group.tecs[0].submit_get(3000, float).result()
+    group.get_parameter(3000, float)
+    # group operations share the worker thread of submitted requests
+    assert len(group.tecs[0].interface.threads) == 1
+
+
+def test_nested_calls_on_worker(group) -> None:
+    tec = group.tecs[0]
+    # tasks running on the worker of an interface may wait for that interface again
+    results = map_tecs(lambda t: t.submit_get(3000, float).result(), [tec], timeout=1)
+    assert list(results) == [21.0]
+    group_results = map_tecs(
+        lambda t: TECGroup([t]).get_parameter(3000, float), [tec], timeout=1
+    )
+    assert list(group_results) == [[21.0]]
+    assert tec.submit_get(3000, float).result(timeout=1) == 21.0
@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+import time
+from typing import Iterator
+
+import pytest
+
+from meer_tec.mecom import Message
+from meer_tec.tec import TEC
+from meer_tec.usb import USB
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="requires a pty")
+
+
+@pytest.fixture
+def pty_device(request, fake_interface) -> Iterator[str]:
+    """
+    Serial device on a pty, answered by the fake interface.
+
+    Parametrize indirectly with a time in seconds to send responses in two parts
+    separated by this gap.
+    """
+    gap = getattr(request, "param", 0.0)
+    if sys.platform == "win32":
+        pytest.skip("requires a pty")
+    import pty
+
+    controller, device = pty.openpty()
+    stop = threading.Event()
+
+    def respond() -> None:
+        buffer = b""
+        while not stop.is_set():
+            try:
+                buffer += os.read(controller, 128)
+            except OSError:
+                return
+            while b"\r" in buffer:
+                frame, buffer = buffer.split(b"\r", 1)
+                response = fake_interface.respond(frame + b"\r").encode("ascii")
+                if gap:
+                    os.write(controller, response[:5])
+                    time.sleep(gap)
+                    response = response[5:]
+                os.write(controller, response)
+
+    thread = threading.Thread(target=respond, daemon=True)
+    thread.start()
+    yield os.ttyname(device)
+    stop.set()
+    os.close(controller)
+    os.close(device)
+
+
+@pytest.mark.parametrize("low_latency", [False, True])
+def test_query(pty_device, fake_interface, low_latency: bool) -> None:
+    fake_interface.set_value(2, 1000, 22.5)
+    usb = USB(pty_device, low_latency=low_latency)
+    start = time.monotonic()
+    assert TEC(usb, 2).object_temperature == 22.5
+    # returns on the terminator instead of waiting for the timeout
+    assert time.monotonic() - start < usb.response_timeout
+    usb.close()
+
+
+@pytest.mark.parametrize("pty_device", [0.03], indirect=True)
+def test_gap_within_response(pty_device, fake_interface) -> None:
+    fake_interface.set_value(2, 1000, 22.5)
+    usb = USB(pty_device, low_latency=True)
+    tec = TEC(usb, 2)
+    # the gap is longer than the poll interval, like the latency timer of a bridge
+    assert [tec.object_temperature for _ in range(3)] == [22.5] * 3
+    usb.close()
+
+
+def test_timeout_without_response(pty_device) -> None:
+    usb = USB(pty_device, timeout=0.05, low_latency=True)
+    request = Message("#010001?VR03E801FF2C\r", value_type=int)
+    usb.protocol.send(request)  # registered as pending, but never sent
+    with pytest.raises(TimeoutError):
+        usb.receive(request)
+    assert usb.protocol.pending == []
+    usb.close()